@@ -1,7 +1,17 @@
 """App package for ADK agent deployment."""
 
-# Import from the new agent.py file for adk web compatibility
-from . import agent
-from agentspace_demo_agent.agents.adk_agent import root_agent
+import importlib
 
 __all__ = ["root_agent", "agent"]
+
+
+def __getattr__(name):
+    # Import the agent lazily so that importing the package (e.g. from the
+    # deployment and invocation scripts) doesn't pay for loading the ADK
+    # until the agent is actually needed. Importing the agent.py file keeps
+    # adk web compatibility.
+    if name == "agent":
+        return importlib.import_module(".agent", __name__)
+    if name == "root_agent":
+        return importlib.import_module(".agent", __name__).root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,59 +1,23 @@
 import os
-import vertexai
+import sys
+import time
 import datetime
-import uuid
-from zoneinfo import ZoneInfo
-from dotenv import load_dotenv
+import functools
+import itertools
 from google.adk.agents import Agent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
-
-# Load environment variables
-load_dotenv()
-
-# Get configuration from environment
-PROJECT_ID = os.getenv("PROJECT_ID")
-LOCATION = os.getenv("LOCATION")
-STAGING_BUCKET = os.getenv("STAGING_BUCKET")
-
-# Initialize Vertex AI with validated configuration
-vertexai.init(
-    project=PROJECT_ID,
-    location=LOCATION,
-    staging_bucket=STAGING_BUCKET,
-)
 
+from agentspace_demo_agent.agents.cities import CITIES, CITY_LIST_PRETTY
+from agentspace_demo_agent.config import init_vertex_ai
 
-def get_weather(city: str) -> dict:
-    """Retrieves the current weather report for a specified city.
 
-    Args:
-        city: The name of the city for which to retrieve the weather report.
-
-    Returns:
-        A dictionary containing status and result or error message.
-    """
-    # Mock weather data for demonstration
-    # In production, this would call a real weather API
-    mock_weather_data = {
-        "new york": "sunny with a temperature of 25 degrees Celsius (77 degrees Fahrenheit)",
-        "london": "cloudy with a temperature of 15 degrees Celsius (59 degrees Fahrenheit)",
-        "tokyo": "clear with a temperature of 28 degrees Celsius (82 degrees Fahrenheit)",
-        "paris": "rainy with a temperature of 18 degrees Celsius (64 degrees Fahrenheit)",
-        "sydney": "partly cloudy with a temperature of 22 degrees Celsius (72 degrees Fahrenheit)",
-        "los angeles": "sunny with a temperature of 26 degrees Celsius (79 degrees Fahrenheit)",
-        "chicago": "windy with a temperature of 20 degrees Celsius (68 degrees Fahrenheit)",
-        "singapore": "humid with a temperature of 30 degrees Celsius (86 degrees Fahrenheit)",
-        "dubai": "hot and sunny with a temperature of 35 degrees Celsius (95 degrees Fahrenheit)",
-        "hong kong": "warm with a temperature of 27 degrees Celsius (81 degrees Fahrenheit)",
-    }
-
-    city_lower = city.lower()
-    if city_lower in mock_weather_data:
+@functools.lru_cache(maxsize=64)
+def _weather_result(city: str) -> dict:
+    # The weather table is static, so results can be cached indefinitely
+    record = CITIES.get(city.lower())
+    if record is not None:
         return {
             "status": "success",
-            "report": f"The weather in {city} is {mock_weather_data[city_lower]}.",
+            "report": f"The weather in {city} is {record.weather}.",
         }
     else:
         return {
@@ -62,6 +26,38 @@ def get_weather(city: str) -> dict:
         }
 
 
+@functools.lru_cache(maxsize=64)
+def _time_result(city: str, timestamp: int) -> dict:
+    # Keyed on the whole second, so repeat calls within a second are cached
+    # and the reported time is never stale by more than the report's precision
+    record = CITIES.get(city.lower())
+    if record is not None:
+        now = datetime.datetime.fromtimestamp(timestamp, record.zoneinfo)
+        report = (
+            f"The current time in {city} is "
+            f"{now.isoformat(timespec='seconds')} ({now.tzname()})"
+        )
+        return {"status": "success", "report": report}
+    else:
+        return {
+            "status": "error",
+            "error_message": f"Sorry, I don't have timezone information for {city}.",
+        }
+
+
+def get_weather(city: str) -> dict:
+    """Retrieves the current weather report for a specified city.
+
+    Args:
+        city: The name of the city for which to retrieve the weather report.
+
+    Returns:
+        A dictionary containing status and result or error message.
+    """
+    # Copy so callers can't mutate the cached result
+    return dict(_weather_result(city))
+
+
 def get_current_time(city: str) -> dict:
     """Returns the current time in a specified city.
 
@@ -71,52 +67,81 @@ def get_current_time(city: str) -> dict:
     Returns:
         A dictionary containing status and result or error message.
     """
-    # Timezone mapping for major cities
-    city_timezones = {
-        "new york": "America/New_York",
-        "london": "Europe/London",
-        "tokyo": "Asia/Tokyo",
-        "paris": "Europe/Paris",
-        "sydney": "Australia/Sydney",
-        "los angeles": "America/Los_Angeles",
-        "chicago": "America/Chicago",
-        "singapore": "Asia/Singapore",
-        "dubai": "Asia/Dubai",
-        "hong kong": "Asia/Hong_Kong",
-    }
-
-    city_lower = city.lower()
-    if city_lower in city_timezones:
-        tz_identifier = city_timezones[city_lower]
-        tz = ZoneInfo(tz_identifier)
-        now = datetime.datetime.now(tz)
-        report = (
-            f"The current time in {city} is {now.strftime('%Y-%m-%d %H:%M:%S %Z%z')}"
-        )
-        return {"status": "success", "report": report}
-    else:
-        return {
-            "status": "error",
-            "error_message": f"Sorry, I don't have timezone information for {city}.",
-        }
+    # Copy so callers can't mutate the cached result
+    return dict(_time_result(city, int(time.time())))
+
+
+# The supported city list is derived from CITIES so the prompt can't drift
+# from what the tools can actually answer
+_INSTRUCTION = f"""You are a helpful agent who can answer user questions about the time and weather in a city.
+
+    Currently supported cities: {CITY_LIST_PRETTY}.
+
+    Be friendly and conversational in your responses."""
 
 
 root_agent = Agent(
     name="weather_time_agent",
     model="gemini-2.5-flash",
     description="Agent to answer questions about the time and weather in a city.",
-    instruction="""You are a helpful agent who can answer user questions about the time and weather in a city.
-    
-    Currently supported cities: New York, London, Tokyo, Paris, Sydney, Los Angeles, 
-    Chicago, Singapore, Dubai, and Hong Kong.
-    
-    Be friendly and conversational in your responses.""",
+    instruction=_INSTRUCTION,
     tools=[get_weather, get_current_time],
 )
 
 
+# Session IDs are a per-process random prefix plus a counter, which keeps them
+# unique without reading from the OS entropy pool for every session
+_SESSION_ID_PREFIX = os.urandom(4).hex()
+_SESSION_ID_COUNTER = itertools.count()
+
+
+def _new_session_id() -> str:
+    return f"session_{_SESSION_ID_PREFIX}{next(_SESSION_ID_COUNTER):08x}"
+
+
+class _StreamBuffer:
+    """Coalesce small streamed text chunks into fewer stdout writes.
+
+    Chunks are held until either ``max_bytes`` have accumulated or
+    ``max_delay`` seconds have passed since the last flush. Both limits are
+    only checked on write, so callers should ``flush()`` once they have no
+    more text to hand over for now (e.g. at the end of each event).
+    """
+
+    def __init__(self, max_bytes: int = 8192, max_delay: float = 0.025) -> None:
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self._chunks: list[str] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, text: str) -> None:
+        self._chunks.append(text)
+        self._size += len(text)
+        if (
+            self._size >= self.max_bytes
+            or time.monotonic() - self._last_flush >= self.max_delay
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._chunks:
+            sys.stdout.write("".join(self._chunks))
+            sys.stdout.flush()
+            self._chunks.clear()
+            self._size = 0
+        self._last_flush = time.monotonic()
+
+
 async def main() -> None:
     """Run demo queries to test the ADK agent functionality."""
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    # Initialize Vertex AI with validated configuration
+    init_vertex_ai()
+
     # Use Runner approach
     session_service = InMemorySessionService()
 
@@ -145,7 +170,7 @@ async def main() -> None:
         print("-" * 50)
 
         # Create a fresh session for each query (following the article's pattern)
-        session_id = f"session_{uuid.uuid4().hex[:8]}"  # Unique session per query
+        session_id = _new_session_id()  # Unique session per query
         user_id = "demo_user"
 
         # Create session right before use
@@ -165,7 +190,8 @@ async def main() -> None:
         # Format the query as content
         content = types.Content(role="user", parts=[types.Part(text=query)])
         print("\nStreaming response...")
-        response_text = ""
+        response_chunks: list[str] = []
+        stream_buffer = _StreamBuffer()
         function_calls = []
         function_responses = []
 
@@ -175,27 +201,36 @@ async def main() -> None:
         )
 
         async for event in events_async:
-            if hasattr(event, "content") and event.content:
-                for part in event.content.parts:
-                    if part.text:
-                        text_chunk = part.text.strip()
-                        if text_chunk:
-                            print(text_chunk, end=" ", flush=True)
-                            response_text += text_chunk + " "
-                    elif part.function_call:
-                        call_info = {
-                            "name": part.function_call.name,
-                            "args": part.function_call.args,
-                        }
-                        function_calls.append(call_info)
-                        print(f"\n[Calling {call_info['name']}...]")
-                    elif part.function_response:
-                        resp_info = {
-                            "name": part.function_response.name,
-                            "response": part.function_response.response,
-                        }
-                        function_responses.append(resp_info)
-                        print(f"[{resp_info['name']} completed]")
+            event_content = getattr(event, "content", None)
+            if not event_content:
+                continue
+            for part in event_content.parts or ():
+                text = part.text
+                if text:
+                    text_chunk = text.strip()
+                    if text_chunk:
+                        stream_buffer.write(text_chunk + " ")
+                        response_chunks.append(text_chunk)
+                    continue
+                function_call = part.function_call
+                if function_call:
+                    name = function_call.name
+                    function_calls.append({"name": name, "args": function_call.args})
+                    stream_buffer.flush()
+                    print(f"\n[Calling {name}...]")
+                    continue
+                function_response = part.function_response
+                if function_response:
+                    name = function_response.name
+                    function_responses.append(
+                        {"name": name, "response": function_response.response}
+                    )
+                    stream_buffer.flush()
+                    print(f"[{name} completed]")
+
+            # Don't hold text back while waiting on the next event, which can
+            # take seconds during model or tool latency
+            stream_buffer.flush()
 
         # Print summary at the end
         print("\n\n" + "-" * 50)
@@ -210,6 +245,7 @@ async def main() -> None:
             for fr in function_responses:
                 print(f"  - {fr['name']}: {fr['response']}")
 
+        response_text = " ".join(response_chunks)
         if not response_text.strip():
             print("\nNo text response received")
 
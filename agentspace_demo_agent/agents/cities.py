@@ -0,0 +1,74 @@
+"""
+Supported cities shared by the agent tools, its prompt and its Agentspace
+registration.
+
+Kept free of ADK imports so the deployment scripts can use it cheaply.
+"""
+
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+
+class CityRecord(NamedTuple):
+    """Everything the tools know about a supported city."""
+
+    weather: str
+    tz: str
+    zoneinfo: ZoneInfo
+
+
+def _city(weather: str, tz: str) -> CityRecord:
+    # Build the ZoneInfo once so tool calls don't re-read tzdata
+    return CityRecord(weather=weather, tz=tz, zoneinfo=ZoneInfo(tz))
+
+
+# Supported cities keyed by lowercase name, shared by both tools.
+# Weather is mock data for demonstration; in production, this would call a
+# real weather API
+CITIES: dict[str, CityRecord] = {
+    "new york": _city(
+        "sunny with a temperature of 25 degrees Celsius (77 degrees Fahrenheit)",
+        "America/New_York",
+    ),
+    "london": _city(
+        "cloudy with a temperature of 15 degrees Celsius (59 degrees Fahrenheit)",
+        "Europe/London",
+    ),
+    "tokyo": _city(
+        "clear with a temperature of 28 degrees Celsius (82 degrees Fahrenheit)",
+        "Asia/Tokyo",
+    ),
+    "paris": _city(
+        "rainy with a temperature of 18 degrees Celsius (64 degrees Fahrenheit)",
+        "Europe/Paris",
+    ),
+    "sydney": _city(
+        "partly cloudy with a temperature of 22 degrees Celsius (72 degrees Fahrenheit)",
+        "Australia/Sydney",
+    ),
+    "los angeles": _city(
+        "sunny with a temperature of 26 degrees Celsius (79 degrees Fahrenheit)",
+        "America/Los_Angeles",
+    ),
+    "chicago": _city(
+        "windy with a temperature of 20 degrees Celsius (68 degrees Fahrenheit)",
+        "America/Chicago",
+    ),
+    "singapore": _city(
+        "humid with a temperature of 30 degrees Celsius (86 degrees Fahrenheit)",
+        "Asia/Singapore",
+    ),
+    "dubai": _city(
+        "hot and sunny with a temperature of 35 degrees Celsius (95 degrees Fahrenheit)",
+        "Asia/Dubai",
+    ),
+    "hong kong": _city(
+        "warm with a temperature of 27 degrees Celsius (81 degrees Fahrenheit)",
+        "Asia/Hong_Kong",
+    ),
+}
+
+# Human-readable list of the supported cities, e.g. for prompts and
+# descriptions, so they can't drift from what the tools can answer
+_CITY_NAMES = [city.title() for city in CITIES]
+CITY_LIST_PRETTY = ", ".join(_CITY_NAMES[:-1]) + ", and " + _CITY_NAMES[-1]
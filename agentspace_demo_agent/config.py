@@ -0,0 +1,79 @@
+"""
+Shared configuration for the agent, deployment and invocation scripts.
+
+The .env file is loaded once per process when this module is first imported,
+and Vertex AI is only re-initialized when the target settings change.
+"""
+
+import os
+import functools
+from dataclasses import dataclass
+from typing import Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Configuration values read from the environment."""
+
+    # GCloud
+    project_id: Optional[str]
+    project_number: Optional[str]
+    location: Optional[str]
+    staging_bucket: Optional[str]
+
+    # Agentspace
+    app_id: Optional[str]
+    as_location: Optional[str]
+
+    # ADK Deployed Agent running in Agent Engine
+    adk_deployment_id: Optional[str]
+    ae_location: Optional[str]
+
+
+@functools.cache
+def settings() -> Settings:
+    """Return the process-wide settings, read from the environment once."""
+    return Settings(
+        project_id=os.getenv("PROJECT_ID"),
+        project_number=os.getenv("PROJECT_NUMBER"),
+        location=os.getenv("LOCATION"),
+        staging_bucket=os.getenv("STAGING_BUCKET"),
+        app_id=os.getenv("APP_ID"),
+        as_location=os.getenv("AS_LOCATION"),
+        adk_deployment_id=os.getenv("ADK_DEPLOYMENT_ID"),
+        ae_location=os.getenv("AE_LOCATION"),
+    )
+
+
+# Settings Vertex AI was last initialized with in this process
+_vertex_ai_settings: Optional[Settings] = None
+
+
+def init_vertex_ai(config: Optional[Settings] = None) -> None:
+    """Initialize Vertex AI for the given settings.
+
+    Defaults to the settings loaded from the environment. Calls with the
+    settings Vertex AI is already initialized with are a no-op, so this is
+    cheap to call from every entry point.
+
+    Args:
+        config: Settings of the target environment.
+    """
+    global _vertex_ai_settings
+
+    config = config or settings()
+    if config == _vertex_ai_settings:
+        return
+
+    import vertexai
+
+    vertexai.init(
+        project=config.project_id,
+        location=config.location,
+        staging_bucket=config.staging_bucket,
+    )
+    _vertex_ai_settings = config
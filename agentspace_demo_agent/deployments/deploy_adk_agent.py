@@ -8,10 +8,14 @@ Agent Engine, allowing it to be accessed as a hosted service.
 
 import os
 import sys
+import asyncio
 import logging
+import tomllib
+import tempfile
+import functools
 import subprocess
-from typing import Optional, List
-from dotenv import load_dotenv
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Tuple
 
 from vertexai import agent_engines
 
@@ -19,6 +23,8 @@ from vertexai import agent_engines
 # This approach allows us to maintain modular code while ensuring
 # Agent Engine can access all necessary modules at runtime
 from agentspace_demo_agent.agents.adk_agent import root_agent
+from agentspace_demo_agent.config import Settings, init_vertex_ai, settings
+from agentspace_demo_agent.deployments.uv_lock import requirements_from_lock
 
 
 # Configure logging
@@ -27,17 +33,63 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-load_dotenv()
 
-# Load environment variables
-PROJECT_ID = os.getenv("PROJECT_ID")
-PROJECT_NUMBER = os.getenv("PROJECT_NUMBER")
-LOCATION = os.getenv("LOCATION")
-STAGING_BUCKET = os.getenv("STAGING_BUCKET")
+UV_LOCK_PATH = "uv.lock"
+
+
+@functools.lru_cache(maxsize=4)
+def _requirements_for(lock_stat: Tuple[int, int]) -> Tuple[str, ...]:
+    """Resolve pinned runtime requirements from uv.lock.
+
+    Args:
+        lock_stat: ``(st_mtime_ns, st_size)`` of uv.lock. Only used as the cache
+            key so that an unchanged lockfile is parsed once per process.
+
+    Returns:
+        Tuple of requirement strings in pip format.
+    """
+    with open(UV_LOCK_PATH, "rb") as f:
+        return requirements_from_lock(tomllib.load(f))
+
+
+def _export_requirements() -> List[str]:
+    """Generate requirements by shelling out to ``uv export``.
+
+    Raises:
+        subprocess.CalledProcessError: If uv export command fails.
+    """
+    # Stream stdout so the output is parsed while uv is still writing it.
+    # stderr goes to a temporary file so a chatty stderr can't fill its pipe
+    # and block uv while we are only reading stdout
+    with tempfile.TemporaryFile(mode="w+") as stderr, subprocess.Popen(
+        [
+            "uv",
+            "export",
+            "--no-hashes",  # Don't include hashes for cleaner output
+            "--no-header",  # Skip the header comment
+            "--no-dev",  # Exclude development dependencies
+            "--no-emit-project",  # Don't include the project itself
+        ],
+        stdout=subprocess.PIPE,
+        stderr=stderr,
+        text=True,
+        bufsize=1,
+    ) as process:
+        # Parse requirements directly from the output
+        requirements = [line.strip() for line in process.stdout if line.strip()]
+
+        returncode = process.wait()
+        if returncode:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                returncode, process.args, stderr=stderr.read()
+            )
+
+    return requirements
 
 
 def generate_requirements() -> List[str]:
-    """Generate requirements dynamically using uv export.
+    """Generate requirements dynamically from the uv lockfile.
 
     This approach has several advantages over hardcoded requirements:
     - Automatically stays in sync with pyproject.toml dependencies
@@ -46,66 +98,72 @@ def generate_requirements() -> List[str]:
     - No manual updates needed when adding/updating packages
     - Agent Engine can still resolve version conflicts if needed
 
+    uv.lock is parsed directly and the result is memoized on the lockfile's
+    mtime and size, so repeat deploys skip the work entirely. ``uv export`` is
+    used when there is no lockfile, it can't be parsed, or it contains git,
+    url or path dependencies that can't be pinned by version. A static list
+    of essential requirements is the last resort.
+
     Returns:
         List of requirements strings in pip format.
-
-    Raises:
-        subprocess.CalledProcessError: If uv export command fails.
     """
-    logger.info("Generating requirements using uv export...")
+    logger.info("Generating requirements from uv.lock...")
 
     try:
-        # Run uv export command
-        result = subprocess.run(
-            [
-                "uv",
-                "export",
-                "--no-hashes",  # Don't include hashes for cleaner output
-                "--no-header",  # Skip the header comment
-                "--no-dev",  # Exclude development dependencies
-                "--no-emit-project",  # Don't include the project itself
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-
-        # Parse requirements directly from the output
-        requirements = [
-            line.strip() for line in result.stdout.splitlines() if line.strip()
-        ]
-
-        logger.info(f"Generated {len(requirements)} requirements")
+        st = os.stat(UV_LOCK_PATH)
+        requirements = list(_requirements_for((st.st_mtime_ns, st.st_size)))
+        logger.info("Generated %s requirements", len(requirements))
         return requirements
+    except FileNotFoundError:
+        logger.info("uv.lock not found, generating requirements using uv export...")
+    except (OSError, ValueError, KeyError, StopIteration) as e:
+        logger.warning("Can't resolve requirements from uv.lock: %r", e)
+        logger.info("Generating requirements using uv export instead...")
 
+    try:
+        requirements = _export_requirements()
+        logger.info("Generated %s requirements", len(requirements))
+        return requirements
     except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to generate requirements: {e}")
-        logger.error(f"Error output: {e.stderr}")
-        # Fallback to essential requirements if uv export fails
-        logger.warning("Falling back to essential requirements...")
-        return [
-            "google-cloud-aiplatform[adk,agent_engines]==1.95.1",
-            "google-adk==1.4.2",
-            "vertexai>=1.43.0",
-            "cloudpickle==3.1.1",
-            "pydantic==2.11.3",
-            "pytz>=2024.1",
-        ]
-
-
-def deploy_agent() -> Optional[str]:
+        logger.error("Failed to generate requirements: %s", e)
+        logger.error("Error output: %s", e.stderr)
+    except FileNotFoundError as e:
+        logger.error("Failed to run uv export: %s", e)
+
+    # Fallback to essential requirements if requirement generation fails
+    logger.warning("Falling back to essential requirements...")
+    return [
+        "google-cloud-aiplatform[adk,agent_engines]==1.95.1",
+        "google-adk==1.4.2",
+        "vertexai>=1.43.0",
+        "cloudpickle==3.1.1",
+        "pydantic==2.11.3",
+        "pytz>=2024.1",
+    ]
+
+
+def deploy_agent(config: Optional[Settings] = None) -> Optional[str]:
     """Deploy the ADK agent to Google Cloud Agent Engine.
 
+    Args:
+        config: Target environment settings. Vertex AI is initialized for
+            them before deploying. Defaults to the settings loaded from the
+            environment.
+
     Returns:
         Resource name of the deployed agent or None if deployment failed.
 
     Raises:
         Exception: If deployment fails for any reason.
     """
+    config = config or settings()
     display_name = "Weather Time Agent"
     description = "An ADK agent that provides weather and time information"
 
     try:
+        # Inside the try so an invalid config fails this deployment only
+        init_vertex_ai(config)
+
         logger.info("Creating deployment package...")
 
         # Generate requirements dynamically from pyproject.toml using uv export
@@ -124,24 +182,24 @@ def deploy_agent() -> Optional[str]:
             extra_packages=["./agentspace_demo_agent"],
             # Environment variables can be added if needed
             env_vars={
-                "PROJECT_ID": PROJECT_ID,
-                "LOCATION": LOCATION,
+                "PROJECT_ID": config.project_id,
+                "LOCATION": config.location,
             },
         )
 
         resource_name = remote_app.resource_name
         logger.info("Successfully deployed agent!")
-        logger.info(f"Resource name: {resource_name}")
+        logger.info("Resource name: %s", resource_name)
 
         # Extract resource ID for easy reference
         resource_id = resource_name.split("/")[-1]
-        logger.info(f"Resource ID: {resource_id}")
+        logger.info("Resource ID: %s", resource_id)
 
         # Test the deployed agent
         logger.info("Testing deployed agent...")
         try:
             test_session = remote_app.create_session(user_id="deployment_test")
-            logger.info(f"Created test session: {test_session['id']}")
+            logger.info("Created test session: %s", test_session['id'])
 
             # Send a test query
             test_response = []
@@ -158,7 +216,7 @@ def deploy_agent() -> Optional[str]:
                 logger.warning("Test query returned no response")
 
         except Exception as e:
-            logger.warning(f"Test query failed: {e}")
+            logger.warning("Test query failed: %s", e)
             logger.info(
                 "Agent deployed but test failed - you may need to check permissions"
             )
@@ -166,11 +224,48 @@ def deploy_agent() -> Optional[str]:
         return resource_name
 
     except Exception as e:
-        logger.error(f"Deployment failed: {e}")
+        logger.error("Deployment failed: %s", e)
         logger.error("Please check your permissions and configuration")
         return None
 
 
+async def deploy_many(configs: List[Settings]) -> List[Optional[str]]:
+    """Deploy the ADK agent to several environments concurrently.
+
+    vertexai.init() configures process-wide state, so each target
+    environment is deployed from its own worker process rather than a thread.
+
+    Args:
+        configs: Settings for each target environment (e.g. dev and staging).
+
+    Returns:
+        Resource names in the same order as ``configs``, with None for any
+        deployment that failed.
+    """
+    if not configs:
+        return []
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=len(configs)) as executor:
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, deploy_agent, config)
+                for config in configs
+            ),
+            return_exceptions=True,
+        )
+
+    # A worker can still fail outside deploy_agent (e.g. the process dies);
+    # report that deployment as failed without losing the others
+    resource_names = []
+    for config, result in zip(configs, results):
+        if isinstance(result, BaseException):
+            logger.error("Deployment to %s failed: %s", config.project_id, result)
+            result = None
+        resource_names.append(result)
+    return resource_names
+
+
 def main() -> None:
     """Main deployment function that orchestrates the agent deployment process."""
     logger.info("Starting agent deployment...")
@@ -178,7 +273,7 @@ def main() -> None:
     resource_name = deploy_agent()
     if resource_name:
         logger.info("\nDeployment successful!")
-        logger.info(f"Your agent is now available at: {resource_name}")
+        logger.info("Your agent is now available at: %s", resource_name)
         logger.info("\nTo use the deployed agent:")
         logger.info("1. Note the resource name above")
         logger.info("2. Use the agent_engines.get() API to access it")
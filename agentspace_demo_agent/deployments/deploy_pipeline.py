@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Deploy ADK Agent to Agent Engine and register it with Agentspace
+
+This script runs both deployment steps in a single process, handing the
+freshly created Agent Engine resource straight to the Agentspace
+registration. Settings are loaded once and shared by both steps, which
+avoids a second interpreter start and copying the deployment ID by hand.
+"""
+
+import sys
+import logging
+
+from agentspace_demo_agent.config import settings
+from agentspace_demo_agent.deployments.deploy_adk_agent import deploy_agent
+from agentspace_demo_agent.deployments.deploy_to_agentspace import (
+    deploy_to_agentspace,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    """Deploy the agent to Agent Engine, then register it with Agentspace."""
+    config = settings()
+    logger.info("Starting deployment pipeline...")
+
+    # Deploy the agent to Agent Engine
+    resource_name = deploy_agent()
+    if not resource_name:
+        logger.error("\n✗ Agent Engine deployment failed. Please check the errors above.")
+        sys.exit(1)
+
+    # Register the new deployment with Agentspace
+    success = deploy_to_agentspace(
+        project_id=config.project_id,
+        app_id=config.app_id,
+        adk_deployment_id=resource_name.split("/")[-1],
+        adk_location=config.location,
+    )
+
+    if success:
+        logger.info("\n✓ Deployment pipeline completed successfully!")
+        logger.info("Agent Engine resource: %s", resource_name)
+    else:
+        logger.error("\n✗ Agentspace deployment failed. Please check the errors above.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
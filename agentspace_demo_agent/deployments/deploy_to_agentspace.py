@@ -6,14 +6,24 @@ This script deploys the ADK agent from Agent Engine to Agentspace,
 making it available as an assistant in the Agentspace app.
 """
 
-import os
 import sys
 import json
+import asyncio
+import time
+import functools
 import logging
+import datetime
 import subprocess
-from typing import Optional
-from dotenv import load_dotenv
-import requests
+from typing import List, Optional, Tuple
+
+from agentspace_demo_agent.agents.cities import CITIES, CITY_LIST_PRETTY
+from agentspace_demo_agent.config import settings
+
+try:
+    from orjson import dumps as _dumps
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 # Configure logging
 logging.basicConfig(
@@ -22,25 +32,92 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+# OAuth access tokens live for an hour; gcloud doesn't report the expiry,
+# so assume a conservative lifetime for tokens obtained that way
+GCLOUD_TOKEN_TTL_SECONDS = 3000.0
+TOKEN_EXPIRY_MARGIN_SECONDS = 300.0
+
+# Stands in for the reasoning engine path in the pre-encoded payload template
+_REASONING_ENGINE_PLACEHOLDER = "__REASONING_ENGINE__"
+
+# In-memory access token cache shared by all deployments in this process
+_TOKEN_CACHE = {"token": None, "expires_at": 0.0}
+
+
+@functools.cache
+def _get_session():
+    """Return the shared HTTP session, creating it on first use.
+
+    Repeated calls reuse the pooled keep-alive connection to the Discovery
+    Engine API. Registering an agent is a non-idempotent POST, so only
+    connection errors (where the request never reached the server) are
+    retried; read errors and error status codes are not.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3, connect=3, read=0, status=0, backoff_factor=0.5
+            ),
+        ),
+    )
+    return session
 
-# Required environment variables
-PROJECT_ID = os.getenv("PROJECT_ID")
-LOCATION = os.getenv("LOCATION")
-APP_ID = os.getenv("APP_ID")
-ADK_DEPLOYMENT_ID = os.getenv("ADK_DEPLOYMENT_ID")
-AE_LOCATION = os.getenv("AE_LOCATION")
+
+class _LazyJSON:
+    """Pretty-print an object as JSON only if the log record is emitted."""
+
+    def __init__(self, obj) -> None:
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj, indent=2)
 
 
 def get_access_token() -> Optional[str]:
     """Get Google Cloud access token for authentication.
-    
+
+    The token is cached in memory and reused until shortly before it expires,
+    so repeated deployments in the same process don't re-authenticate.
+
     Returns:
         Access token string or None if failed.
     """
+    if _TOKEN_CACHE["token"] and time.monotonic() < _TOKEN_CACHE["expires_at"]:
+        return _TOKEN_CACHE["token"]
+
+    # Prefer Application Default Credentials, which report a real expiry
+    try:
+        import google.auth
+        import google.auth.transport.requests
+
+        credentials, project = google.auth.default()
+        auth_request = google.auth.transport.requests.Request()
+        credentials.refresh(auth_request)
+
+        if credentials.token:
+            ttl = GCLOUD_TOKEN_TTL_SECONDS
+            if credentials.expiry is not None:
+                # google-auth reports expiry as a naive UTC datetime
+                expiry = credentials.expiry.replace(tzinfo=datetime.timezone.utc)
+                remaining = expiry - datetime.datetime.now(datetime.timezone.utc)
+                ttl = remaining.total_seconds() - TOKEN_EXPIRY_MARGIN_SECONDS
+            _cache_token(credentials.token, ttl)
+            logger.info("Successfully obtained access token via ADC")
+            return credentials.token
+    except Exception as e:
+        # Not fatal: fall back to the gcloud CLI below
+        logger.warning("Failed to get access token via ADC: %s", e)
+
+    # Alternative: Try to get access token using gcloud
     try:
-        # Try to get access token using gcloud
         result = subprocess.run(
             ["gcloud", "auth", "print-access-token"],
             capture_output=True,
@@ -49,31 +126,104 @@ def get_access_token() -> Optional[str]:
         )
         token = result.stdout.strip()
         if token:
+            _cache_token(token, GCLOUD_TOKEN_TTL_SECONDS)
             logger.info("Successfully obtained access token")
             return token
     except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to get access token via gcloud: {e}")
+        logger.error("Failed to get access token via gcloud: %s", e)
     except FileNotFoundError:
         logger.error("gcloud CLI not found. Please install Google Cloud SDK.")
-    
-    # Alternative: Try using Application Default Credentials
-    try:
-        import google.auth
-        import google.auth.transport.requests
-        
-        credentials, project = google.auth.default()
-        auth_request = google.auth.transport.requests.Request()
-        credentials.refresh(auth_request)
-        
-        if credentials.token:
-            logger.info("Successfully obtained access token via ADC")
-            return credentials.token
-    except Exception as e:
-        logger.error(f"Failed to get access token via ADC: {e}")
-    
+
     return None
 
 
+def _cache_token(token: str, ttl: float) -> None:
+    """Store an access token in the in-memory cache for ``ttl`` seconds."""
+    _TOKEN_CACHE["token"] = token
+    _TOKEN_CACHE["expires_at"] = time.monotonic() + max(ttl, 0.0)
+
+
+def _clear_token_cache() -> None:
+    """Drop the cached access token so the next call re-authenticates.
+
+    Called when the API rejects a token with 401, since a gcloud token may
+    expire before the assumed ``GCLOUD_TOKEN_TTL_SECONDS``.
+    """
+    _TOKEN_CACHE["token"] = None
+    _TOKEN_CACHE["expires_at"] = 0.0
+
+
+def _build_payload(reasoning_engine: str) -> dict:
+    """Build the Agentspace agent registration payload."""
+    return {
+        "displayName": "Weather Time Agent",
+        "description": "An ADK agent that provides weather and time information for major cities",
+        "icon": {
+            "uri": "https://fonts.gstatic.com/s/i/materialicons/wb_sunny/v1/24px.svg"
+        },
+        "adk_agent_definition": {
+            "tool_settings": {
+                "tool_description": (
+                    "This agent provides weather and time information for "
+                    f"{len(CITIES)} major cities: {CITY_LIST_PRETTY}"
+                )
+            },
+            "provisioned_reasoning_engine": {
+                "reasoning_engine": reasoning_engine
+            }
+        }
+    }
+
+
+@functools.cache
+def _payload_template() -> bytes:
+    """Encode the static parts of the payload once, with an engine placeholder."""
+    return _dumps(_build_payload(_REASONING_ENGINE_PLACEHOLDER))
+
+
+def _payload_body(reasoning_engine: str) -> bytes:
+    """Return the encoded JSON request body for the given reasoning engine.
+
+    Only the reasoning engine path changes between calls, so it is spliced
+    into the pre-encoded template instead of re-encoding the whole payload.
+    """
+    # Encode as a JSON string and drop the quotes so it is escaped correctly
+    encoded_engine = _dumps(reasoning_engine)[1:-1]
+    return _payload_template().replace(
+        _REASONING_ENGINE_PLACEHOLDER.encode(), encoded_engine
+    )
+
+
+def _agents_endpoint(project_id: str, app_id: str) -> str:
+    """Build the Agentspace agents collection endpoint for an app."""
+    # Note: You must match the agent engine region to the Agentspace app region
+    base_url = "https://discoveryengine.googleapis.com"
+    return (
+        f"{base_url}/v1alpha/projects/{project_id}/locations/{settings().ae_location}/"
+        f"collections/default_collection/engines/{app_id}/"
+        f"assistants/default_assistant/agents"
+    )
+
+
+def _reasoning_engine_path(
+    project_id: str, adk_location: str, adk_deployment_id: str
+) -> str:
+    """Build the resource path of an ADK deployment in Agent Engine."""
+    return (
+        f"projects/{project_id}/locations/{adk_location}/"
+        f"reasoningEngines/{adk_deployment_id}"
+    )
+
+
+def _request_headers(access_token: str, project_id: str) -> dict:
+    """Build the headers for Discovery Engine API requests."""
+    return {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json",
+        "X-Goog-User-Project": project_id
+    }
+
+
 def deploy_to_agentspace(
     project_id: str,
     app_id: str,
@@ -91,6 +241,8 @@ def deploy_to_agentspace(
     Returns:
         True if deployment successful, False otherwise.
     """
+    import requests
+
     # Get access token
     access_token = get_access_token()
     if not access_token:
@@ -98,84 +250,55 @@ def deploy_to_agentspace(
         return False
     
     # Construct the API endpoint
-    # Note: You must match the agent engine region to the Agentspace app region
-    base_url = "https://discoveryengine.googleapis.com"
-    endpoint = (
-        f"{base_url}/v1alpha/projects/{project_id}/locations/{AE_LOCATION}/"
-        f"collections/default_collection/engines/{app_id}/"
-        f"assistants/default_assistant/agents"
-    )
+    endpoint = _agents_endpoint(project_id, app_id)
     
     # Prepare the request payload
-    payload = {
-        "displayName": "Weather Time Agent",
-        "description": "An ADK agent that provides weather and time information for major cities",
-        "icon": {
-            "uri": "https://fonts.gstatic.com/s/i/materialicons/wb_sunny/v1/24px.svg"
-        },
-        "adk_agent_definition": {
-            "tool_settings": {
-                "tool_description": (
-                    "This agent provides weather and time information for 10 major cities: "
-                    "New York, London, Tokyo, Paris, Sydney, Los Angeles, Chicago, Singapore, "
-                    "Dubai, and Hong Kong"
-                )
-            },
-            "provisioned_reasoning_engine": {
-                "reasoning_engine": (
-                    f"projects/{project_id}/locations/{adk_location}/"
-                    f"reasoningEngines/{adk_deployment_id}"
-                )
-            }
-        }
-    }
-    print(f"\n\n{payload}\n\n")
+    body = _payload_body(
+        _reasoning_engine_path(project_id, adk_location, adk_deployment_id)
+    )
+    print(f"\n\n{body.decode()}\n\n")
     
     # Prepare headers
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-        "X-Goog-User-Project": project_id
-    }
+    headers = _request_headers(access_token, project_id)
     
     # Log the deployment details
     logger.info("Deploying agent to Agentspace...")
-    logger.info(f"Project ID: {project_id}")
-    logger.info(f"App ID: {app_id}")
-    logger.info(f"ADK Deployment ID: {adk_deployment_id}")
-    logger.info(f"ADK Location: {adk_location}")
-    logger.info(f"Endpoint: {endpoint}")
+    logger.info("Project ID: %s", project_id)
+    logger.info("App ID: %s", app_id)
+    logger.info("ADK Deployment ID: %s", adk_deployment_id)
+    logger.info("ADK Location: %s", adk_location)
+    logger.info("Endpoint: %s", endpoint)
     
     try:
         # Make the API request
-        response = requests.post(
+        response = _get_session().post(
             endpoint,
             headers=headers,
-            json=payload,
+            data=body,
             timeout=60
         )
         
         # Check response
         if response.status_code == 200 or response.status_code == 201:
             logger.info("✓ Successfully deployed agent to Agentspace!")
-            logger.info(f"Response: {json.dumps(response.json(), indent=2)}")
+            agent_data = response.json()
+            logger.info("Response: %s", _LazyJSON(agent_data))
             
             # Extract agent details from response
-            agent_data = response.json()
             if "name" in agent_data:
-                logger.info(f"Agent resource name: {agent_data['name']}")
+                logger.info("Agent resource name: %s", agent_data['name'])
             
             return True
         else:
-            logger.error(f"✗ Deployment failed with status code: {response.status_code}")
-            logger.error(f"Response: {response.text}")
+            logger.error("✗ Deployment failed with status code: %s", response.status_code)
+            logger.error("Response: %s", response.text)
             
             # Provide helpful error messages
             if response.status_code == 404:
                 logger.error("The app or endpoint was not found. Please check:")
-                logger.error(f"- App ID is correct: {app_id}")
-                logger.error(f"- The app exists in project: {project_id}")
-                logger.error(f"- The app is in the region corresponding to the Agent Engine {AE_LOCATION} location")
+                logger.error("- App ID is correct: %s", app_id)
+                logger.error("- The app exists in project: %s", project_id)
+                logger.error("- The app is in the region corresponding to the Agent Engine %s location", settings().ae_location)
             elif response.status_code == 403:
                 logger.error("Permission denied. Please check:")
                 logger.error("- You have the necessary IAM roles (Discovery Engine Admin)")
@@ -184,6 +307,9 @@ def deploy_to_agentspace(
                 logger.error("Bad request. Please check:")
                 logger.error("- The ADK deployment exists and is accessible")
                 logger.error("- The payload format is correct")
+            elif response.status_code == 401:
+                _clear_token_cache()
+                logger.error("The access token was rejected. It has been discarded; please retry.")
                 
             return False
             
@@ -191,39 +317,111 @@ def deploy_to_agentspace(
         logger.error("Request timed out. The deployment might still be in progress.")
         return False
     except requests.exceptions.RequestException as e:
-        logger.error(f"Request failed: {e}")
+        logger.error("Request failed: %s", e)
         return False
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
+        return False
+
+
+async def deploy_many_to_agentspace(
+    project_id: str,
+    app_id: str,
+    deployments: List[Tuple[str, str]],
+    max_connections: int = 16,
+) -> List[bool]:
+    """Register several ADK deployments with the same Agentspace app concurrently.
+
+    All requests share one HTTP/2 client, so the registrations are multiplexed
+    over a single connection instead of each paying for its own TLS handshake.
+
+    Args:
+        project_id: Google Cloud project ID
+        app_id: Agentspace app ID
+        deployments: (ADK deployment ID, ADK location) pairs to register
+        max_connections: Upper bound on concurrent connections to the API
+
+    Returns:
+        One flag per deployment, True if that registration succeeded.
+    """
+    import httpx
+
+    if not deployments:
+        return []
+
+    access_token = get_access_token()
+    if not access_token:
+        logger.error("Unable to obtain access token. Cannot proceed with deployment.")
+        return [False] * len(deployments)
+
+    endpoint = _agents_endpoint(project_id, app_id)
+    headers = _request_headers(access_token, project_id)
+    limits = httpx.Limits(
+        max_connections=max_connections, max_keepalive_connections=max_connections
+    )
+
+    async def register(
+        client: httpx.AsyncClient, adk_deployment_id: str, adk_location: str
+    ) -> bool:
+        body = _payload_body(
+            _reasoning_engine_path(project_id, adk_location, adk_deployment_id)
+        )
+        try:
+            response = await client.post(endpoint, headers=headers, content=body)
+        except httpx.HTTPError as e:
+            logger.error("Request for ADK deployment %s failed: %s", adk_deployment_id, e)
+            return False
+
+        if response.status_code == 200 or response.status_code == 201:
+            logger.info("✓ Registered ADK deployment %s with Agentspace", adk_deployment_id)
+            return True
+        if response.status_code == 401:
+            _clear_token_cache()
+        logger.error(
+            "✗ Registering ADK deployment %s failed with status code %s: %s",
+            adk_deployment_id,
+            response.status_code,
+            response.text,
+        )
         return False
 
+    logger.info("Deploying %s agents to Agentspace...", len(deployments))
+    async with httpx.AsyncClient(http2=True, limits=limits, timeout=60) as client:
+        return await asyncio.gather(
+            *(
+                register(client, adk_deployment_id, adk_location)
+                for adk_deployment_id, adk_location in deployments
+            )
+        )
+
 
 def main():
     """Main function to deploy the agent."""
+    config = settings()
     logger.info("Starting Agentspace deployment...")
     logger.info("=" * 60)
     
     # Display configuration
     logger.info("Configuration:")
-    logger.info(f"  PROJECT_ID: {PROJECT_ID}")
-    logger.info(f"  APP_ID: {APP_ID}")
-    logger.info(f"  ADK_DEPLOYMENT_ID: {ADK_DEPLOYMENT_ID}")
-    logger.info(f"  ADK_LOCATION: {LOCATION}")
+    logger.info("  PROJECT_ID: %s", config.project_id)
+    logger.info("  APP_ID: %s", config.app_id)
+    logger.info("  ADK_DEPLOYMENT_ID: %s", config.adk_deployment_id)
+    logger.info("  ADK_LOCATION: %s", config.location)
     logger.info("=" * 60)
     
     # Deploy the agent
     success = deploy_to_agentspace(
-        project_id=PROJECT_ID,
-        app_id=APP_ID,
-        adk_deployment_id=ADK_DEPLOYMENT_ID,
-        adk_location=LOCATION
+        project_id=config.project_id,
+        app_id=config.app_id,
+        adk_deployment_id=config.adk_deployment_id,
+        adk_location=config.location
     )
     
     if success:
         logger.info("\n✓ Deployment completed successfully!")
         logger.info("\nNext steps:")
         logger.info("1. Go to the Agentspace console to verify the deployment")
-        logger.info(f"2. Test the agent at: https://console.cloud.google.com/gen-app-builder/locations/{AE_LOCATION}/engines/{APP_ID}")
+        logger.info("2. Test the agent at: https://console.cloud.google.com/gen-app-builder/locations/%s/engines/%s", config.ae_location, config.app_id)
         logger.info("3. Configure any additional settings as needed")
     else:
         logger.error("\n✗ Deployment failed. Please check the errors above.")
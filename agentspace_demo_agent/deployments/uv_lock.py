@@ -0,0 +1,122 @@
+"""
+Resolve pinned runtime requirements from a uv lockfile.
+
+Kept free of Vertex AI and ADK imports so the resolver can be used (and
+tested) without loading the deployment SDKs.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+
+def _is_project_package(package: Dict[str, Any]) -> bool:
+    """Check whether a uv.lock package entry is the local project itself."""
+    source = package.get("source", {})
+    return source.get("editable") == "." or source.get("virtual") == "."
+
+
+def _format_conditions(conditions: set) -> str:
+    """Render the conditions a package is required under as a PEP 508 marker.
+
+    Each condition is a set of markers that must all hold; the package is
+    needed if any condition holds. Returns an empty string when the package
+    is required unconditionally.
+    """
+    # A condition that is a superset of another one adds nothing
+    minimal = [
+        condition
+        for condition in conditions
+        if not any(other < condition for other in conditions)
+    ]
+    if frozenset() in minimal:
+        return ""
+
+    clauses = sorted(
+        " and ".join(
+            f"({marker})" if len(condition) > 1 else marker
+            for marker in sorted(condition)
+        )
+        for condition in minimal
+    )
+    if len(clauses) == 1:
+        return clauses[0]
+    return " or ".join(f"({clause})" for clause in clauses)
+
+
+def requirements_from_lock(lock: Dict[str, Any]) -> Tuple[str, ...]:
+    """Resolve pinned runtime requirements from a parsed uv.lock.
+
+    Walks the project's non-dev dependency graph (including requested extras)
+    and emits one ``name==version`` line per reachable package, carrying over
+    environment markers for packages that are only conditionally required.
+
+    Args:
+        lock: uv.lock contents as parsed by ``tomllib``.
+
+    Returns:
+        Tuple of requirement strings in pip format.
+
+    Raises:
+        ValueError: If a reachable package doesn't come from a registry
+            (git, url, path or directory sources), since it can't be pinned
+            as ``name==version``.
+        KeyError, StopIteration: If the lockfile is missing expected entries.
+    """
+    packages: Dict[str, List[Dict[str, Any]]] = {}
+    for package in lock.get("package", []):
+        packages.setdefault(package["name"], []).append(package)
+
+    root = next(
+        package for package in lock.get("package", []) if _is_project_package(package)
+    )
+
+    def resolve(dep: Dict[str, Any]) -> Dict[str, Any]:
+        candidates = packages[dep["name"]]
+        if "version" in dep:
+            for candidate in candidates:
+                if candidate.get("version") == dep["version"]:
+                    return candidate
+        return candidates[0]
+
+    # Package key -> conditions it is required under. A condition is the set
+    # of edge markers along one path from the project, all of which must hold;
+    # an empty condition means the package is required unconditionally
+    conditions: Dict[Tuple[str, str], set] = {}
+    resolved: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    visited = set()
+    pending = [(dep, frozenset()) for dep in root.get("dependencies", [])]
+
+    while pending:
+        dep, parent_condition = pending.pop()
+        package = resolve(dep)
+        key = (package["name"], package.get("version", ""))
+        condition = parent_condition
+        if dep.get("marker"):
+            condition = parent_condition | {dep["marker"]}
+        extras = tuple(dep.get("extra", ()))
+        if (key, condition, extras) in visited:
+            continue
+        visited.add((key, condition, extras))
+        resolved[key] = package
+        conditions.setdefault(key, set()).add(condition)
+
+        edges = list(package.get("dependencies", []))
+        for extra in extras:
+            edges.extend(package.get("optional-dependencies", {}).get(extra, []))
+        pending.extend((edge, condition) for edge in edges)
+
+    requirements = []
+    for key in sorted(resolved):
+        package = resolved[key]
+        if _is_project_package(package):
+            continue
+        if "registry" not in package.get("source", {"registry": None}):
+            raise ValueError(
+                f"{package['name']} is not from a registry "
+                f"(source: {package['source']}) and can't be pinned by version"
+            )
+        requirement = f"{package['name']}=={package['version']}"
+        marker = _format_conditions(conditions[key])
+        if marker:
+            requirement += " ; " + marker
+        requirements.append(requirement)
+    return tuple(requirements)
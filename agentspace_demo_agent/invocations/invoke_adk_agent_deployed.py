@@ -3,21 +3,32 @@
 Test the ADK agent deployed on Agent Engine.
 """
 
-import os
-import vertexai
-from vertexai import agent_engines
-from dotenv import load_dotenv
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator
+
+from agentspace_demo_agent.config import init_vertex_ai, settings
 from agentspace_demo_agent.invocations.response_utils import (
+    FUNCTION_CALL,
+    FUNCTION_RESPONSE,
+    TEXT,
     process_stream_response,
-    display_response_parts,
 )
 
-load_dotenv()
+# Marks the end of a query's event stream
+_END_OF_STREAM = object()
+
+
+def _drain(events: queue.Queue) -> Iterator[Dict[str, Any]]:
+    """Yield a query's events from its queue until the end of the stream.
 
-# Load environment variables
-PROJECT_ID = os.getenv("PROJECT_ID")
-LOCATION = os.getenv("LOCATION")
-ADK_DEPLOYMENT_ID = os.getenv("ADK_DEPLOYMENT_ID")
+    Raises:
+        Exception: The error the query's worker failed with, if any.
+    """
+    for event in iter(events.get, _END_OF_STREAM):
+        if isinstance(event, Exception):
+            raise event
+        yield event
 
 
 def test_deployed_agent(agent_resource_name: str) -> None:
@@ -43,35 +54,71 @@ def test_deployed_agent(agent_resource_name: str) -> None:
     print(f"Agent Resource: {agent_resource_name}")
     print("=" * 60)
 
+    from vertexai import agent_engines
+
     # Initialize Vertex AI
-    vertexai.init(project=PROJECT_ID, location=LOCATION)
+    init_vertex_ai()
 
     try:
         # Get the deployed agent
         agent = agent_engines.get(agent_resource_name)
         print("✓ Successfully connected to deployed agent")
 
-        # Create a session for testing
-        session = agent.create_session(user_id="test_user")
-        print(f"✓ Session created: {session['id']}")
-
     except Exception as e:
         print(f"✗ Error connecting to deployed agent: {e}")
         return
 
-    for i, query in enumerate(test_queries, 1):
-        print(f"\nTest {i}: {query}")
-        print("-" * 60)
-
+    def run_query(query: str, events: queue.Queue) -> None:
+        # Each query gets its own session so they can run concurrently
         try:
-            stream_events = agent.stream_query(
+            session = agent.create_session(user_id="test_user")
+            for event in agent.stream_query(
                 user_id="test_user", session_id=session["id"], message=query
-            )
-            response_parts = process_stream_response(stream_events)
-            display_response_parts(response_parts)
-
+            ):
+                events.put(event)
         except Exception as e:
-            print(f"Error: {e}")
+            events.put(e)
+        finally:
+            events.put(_END_OF_STREAM)
+
+    # The queries are independent, so dispatch them all at once. Results are
+    # shown in order, with the current query printed as its events arrive
+    # while the later ones keep running in the background
+    event_queues = [queue.Queue() for _ in test_queries]
+    with ThreadPoolExecutor(max_workers=len(test_queries)) as executor:
+        for query, events in zip(test_queries, event_queues):
+            executor.submit(run_query, query, events)
+
+        for i, (query, events) in enumerate(zip(test_queries, event_queues), 1):
+            print(f"\nTest {i}: {query}")
+            print("-" * 60)
+
+            function_calls = []
+            got_text = False
+            failed = False
+            try:
+                # Print each part as soon as its event arrives
+                for part_type, part_content in process_stream_response(_drain(events)):
+                    if part_type is TEXT:
+                        if part_content:
+                            print(part_content, flush=True)
+                            got_text = True
+                    elif part_type is FUNCTION_CALL:
+                        function_calls.append(part_content)
+                        print(f"[Calling {part_content.name}...]", flush=True)
+                    elif part_type is FUNCTION_RESPONSE:
+                        print(f"[{part_content} completed]", flush=True)
+            except Exception as e:
+                print(f"Error: {e}")
+                failed = True
+
+            if function_calls:
+                print("\nFunction calls summary:")
+                for fc in function_calls:
+                    print(f"  - {fc.name}: {fc.args or {}}")
+
+            if not (got_text or function_calls or failed):
+                print("No response received")
 
     print("\n" + "=" * 60)
     print("Deployed agent testing completed!")
@@ -83,9 +130,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Test deployed ADK agent")
     
     # Construct default resource name from environment variables
+    config = settings()
     default_resource_name = None
-    if PROJECT_ID and LOCATION and ADK_DEPLOYMENT_ID:
-        default_resource_name = f"projects/{PROJECT_ID}/locations/{LOCATION}/reasoningEngines/{ADK_DEPLOYMENT_ID}"
+    if config.project_id and config.location and config.adk_deployment_id:
+        default_resource_name = f"projects/{config.project_id}/locations/{config.location}/reasoningEngines/{config.adk_deployment_id}"
     
     parser.add_argument(
         "--id",
@@ -3,8 +3,12 @@
 Test the ADK agent locally before deployment.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Tuple
+
 from vertexai.preview import reasoning_engines
 from agentspace_demo_agent.agents.adk_agent import root_agent
+from agentspace_demo_agent.config import init_vertex_ai
 from agentspace_demo_agent.invocations.response_utils import (
     process_stream_response,
     display_response_parts,
@@ -28,28 +32,41 @@ def test_agent() -> None:
     print("Testing ADK Agent locally...")
     print("=" * 60)
 
+    # Initialize Vertex AI
+    init_vertex_ai()
+
     # Create the app once for all tests
     app = reasoning_engines.AdkApp(
         agent=root_agent,
         enable_tracing=True,
     )
+    # AdkApp sets itself up lazily on first use; do it once here so the
+    # worker threads share one runner and session service
+    app.set_up()
+
+    def run_query(query: str) -> List[Tuple[str, Any]]:
+        # Each query gets its own session so they can run concurrently
+        session = app.create_session(user_id="local_test_user")
+        stream_events = app.stream_query(
+            user_id="local_test_user", session_id=session.id, message=query
+        )
+        # Drain the stream in the worker so the query runs concurrently
+        return list(process_stream_response(stream_events))
 
-    # Create a session for testing
-    session = app.create_session(user_id="local_test_user")
+    # The queries are independent, so dispatch them all at once and
+    # display the results in order as they complete
+    with ThreadPoolExecutor(max_workers=len(test_queries)) as executor:
+        futures = [executor.submit(run_query, query) for query in test_queries]
 
-    for i, query in enumerate(test_queries, 1):
-        print(f"\nTest {i}: {query}")
-        print("-" * 60)
+        for i, (query, future) in enumerate(zip(test_queries, futures), 1):
+            print(f"\nTest {i}: {query}")
+            print("-" * 60)
 
-        try:
-            stream_events = app.stream_query(
-                user_id="local_test_user", session_id=session.id, message=query
-            )
-            response_parts = process_stream_response(stream_events)
-            display_response_parts(response_parts)
+            try:
+                display_response_parts(future.result())
 
-        except Exception as e:
-            print(f"Error: {e}")
+            except Exception as e:
+                print(f"Error: {e}")
 
     print("\n" + "=" * 60)
     print("Local invocation with vertexai reasoning engine completed!")
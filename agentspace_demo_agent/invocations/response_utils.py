@@ -3,60 +3,183 @@
 Utility functions for processing and displaying agent responses.
 """
 
-from typing import List, Tuple, Any, Iterator, Dict
+import sys
+from types import MappingProxyType
+from typing import Tuple, Any, Iterable, Iterator, Dict, Mapping, Optional, Sequence, Union
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# Part type tags. They are interned so consumers can compare with ``is``
+TEXT = sys.intern("text")
+FUNCTION_CALL = sys.intern("function_call")
+FUNCTION_RESPONSE = sys.intern("function_response")
+OTHER = sys.intern("other")
+
+
+# Shared, read-only args for function calls that don't carry any
+_EMPTY_ARGS = MappingProxyType({})
+
+
+class FunctionCall:
+    """A function call requested by the agent.
+
+    ``args`` is a shared read-only mapping when the call has no arguments,
+    so copy it before mutating.
+    """
+
+    __slots__ = ("name", "args")
+
+    def __init__(self, name: str, args: Mapping[str, Any]) -> None:
+        self.name = name
+        self.args = args
+
+    def __repr__(self) -> str:
+        return f"FunctionCall(name={self.name!r}, args={self.args!r})"
+
+
+def _strip_edges(text: str) -> str:
+    """Strip surrounding whitespace, skipping strip() when there is none."""
+    # Most streamed tokens have no edge whitespace, so only call strip()
+    # when there is something to strip
+    if text and (text[0].isspace() or text[-1].isspace()):
+        return text.strip()
+    return text
 
 
 def process_stream_response(
-    stream_events: Iterator[Dict[str, Any]],
-) -> List[Tuple[str, Any]]:
+    stream_events: Iterator[Union[Dict[str, Any], str, bytes]],
+) -> Iterator[Tuple[str, Any]]:
     """Process streaming response events and extract response parts.
 
+    Parts are yielded as soon as their event arrives. Wrap the result in
+    ``list()`` if the parts need to be kept.
+
     Args:
-        stream_events: Iterator of streaming response events.
+        stream_events: Iterator of streaming response events. Events may also
+            be raw JSON strings or bytes, which are decoded with orjson when
+            it is installed.
 
-    Returns:
-        List of tuples containing (part_type, part_content).
+    Yields:
+        Tuples containing (part_type, part_content), where part_type is one
+        of TEXT, FUNCTION_CALL, FUNCTION_RESPONSE or OTHER. FUNCTION_RESPONSE
+        parts are given as the name of the function that responded, and OTHER
+        parts as their repr.
     """
-    response_parts = []
     for event in stream_events:
-        # Extract all parts from the event
-        if isinstance(event, dict) and "content" in event:
-            content = event["content"]
-            if "parts" in content:
-                for part in content["parts"]:
-                    if "text" in part:
-                        response_parts.append(("text", part["text"].strip()))
-                    elif "function_call" in part:
-                        func_call = part["function_call"]
-                        response_parts.append(
-                            (
-                                "function_call",
-                                {
-                                    "name": func_call.get("name", "unknown"),
-                                    "args": func_call.get("args", {}),
-                                },
-                            )
-                        )
-                    else:
-                        # Handle any other part types
-                        response_parts.append(("other", part))
-    return response_parts
-
-
-def display_response_parts(response_parts: List[Tuple[str, Any]]) -> None:
+        if isinstance(event, (bytes, str)):
+            try:
+                event = _loads(event)
+            except ValueError:
+                continue
+
+        # Extract all parts from the event. Nearly every event is a dict with
+        # content, so index directly and skip the rare event that isn't
+        try:
+            parts = event["content"]["parts"]
+        except (KeyError, TypeError):
+            continue
+        if not parts:
+            continue
+
+        # Fast path for the most common shape: a single text part
+        if len(parts) == 1:
+            text = parts[0].get("text")
+            if text is not None:
+                yield (TEXT, _strip_edges(text))
+                continue
+
+        for part in parts:
+            text = part.get("text")
+            if text is not None:
+                yield (TEXT, _strip_edges(text))
+                continue
+
+            func_call = part.get("function_call")
+            if func_call is not None:
+                get = func_call.get
+                args = get("args")
+                if args is None:
+                    args = _EMPTY_ARGS
+                yield (FUNCTION_CALL, FunctionCall(get("name") or "unknown", args))
+                continue
+
+            func_response = part.get("function_response")
+            if func_response is not None:
+                yield (FUNCTION_RESPONSE, func_response.get("name") or "unknown")
+                continue
+
+            # Handle any other part types. Keep only their repr so large
+            # payloads (e.g. inline images or audio) aren't held by callers
+            # that retain the parts
+            yield (OTHER, repr(part))
+
+
+def _format_text(text: str) -> str:
+    return f"Response: {text}"
+
+
+def _format_function_call(func_call: FunctionCall) -> str:
+    # Show calls without arguments as {} rather than the shared mapping proxy
+    return f"Function Call: {func_call.name}\n  Args: {func_call.args or {}}"
+
+
+def _format_function_response(name: str) -> str:
+    return f"Function Response: {name}"
+
+
+def _format_other(part: str) -> str:
+    return f"Other part: {part}"
+
+
+# Formatter for each part type, looked up once per part
+_FORMATTERS = {
+    TEXT: _format_text,
+    FUNCTION_CALL: _format_function_call,
+    FUNCTION_RESPONSE: _format_function_response,
+}
+
+
+def display_response_parts(
+    response_parts: Iterable[Tuple[str, Any]], flush_every: Optional[int] = None
+) -> None:
     """Display processed response parts in a formatted way.
 
+    Formatted lines are collected and written to stdout in batches of
+    ``flush_every`` parts rather than one print per line. By default a list
+    of parts is written in one go, while a stream (such as the generator from
+    process_stream_response) is written part by part as it arrives.
+
     Args:
-        response_parts: List of tuples containing (part_type, part_content).
+        response_parts: Iterable of tuples containing (part_type, part_content).
+        flush_every: Number of parts to collect before writing them out.
+            Defaults to all of them for a sized sequence and 1 otherwise.
     """
-    if response_parts:
-        for part_type, part_content in response_parts:
-            if part_type == "text":
-                print(f"Response: {part_content}")
-            elif part_type == "function_call":
-                print(f"Function Call: {part_content['name']}")
-                print(f"  Args: {part_content['args']}")
-            else:
-                print(f"Other part: {part_content}")
-    else:
-        print("No response received")
+    if flush_every is None:
+        flush_every = len(response_parts) if isinstance(response_parts, Sequence) else 1
+
+    out = []
+    pending = 0
+    found = False
+    for part_type, part_content in response_parts:
+        found = True
+        out.append(_FORMATTERS.get(part_type, _format_other)(part_content))
+
+        pending += 1
+        if pending >= flush_every:
+            _write_lines(out)
+            pending = 0
+    if not found:
+        out.append("No response received")
+    _write_lines(out)
+
+
+def _write_lines(lines: list) -> None:
+    """Write lines to stdout in a single call and clear the buffer."""
+    if lines:
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
+        lines.clear()
@@ -0,0 +1,142 @@
+"""Tests for resolving deployment requirements from uv.lock."""
+
+import tomllib
+
+import pytest
+
+from agentspace_demo_agent.deployments.uv_lock import requirements_from_lock
+
+PYPI = '{ registry = "https://pypi.org/simple" }'
+
+
+def _lock(body: str) -> dict:
+    return tomllib.loads(
+        f"""
+version = 1
+
+[[package]]
+name = "agentspace-demo-agent"
+version = "0.1.0"
+source = {{ editable = "." }}
+{body}
+"""
+    )
+
+
+def test_extras_and_nested_markers():
+    lock = _lock(
+        f"""
+dependencies = [
+    {{ name = "a", extra = ["fast"] }},
+    {{ name = "d", marker = "platform_machine == 'x86_64'" }},
+]
+
+[package.dev-dependencies]
+dev = [{{ name = "pytest" }}]
+
+[[package]]
+name = "a"
+version = "1.0"
+source = {PYPI}
+dependencies = [{{ name = "b" }}]
+
+[package.optional-dependencies]
+fast = [{{ name = "c" }}]
+slow = [{{ name = "unused" }}]
+
+[[package]]
+name = "b"
+version = "2.0"
+source = {PYPI}
+dependencies = [{{ name = "a" }}]
+
+[[package]]
+name = "c"
+version = "3.0"
+source = {PYPI}
+
+[[package]]
+name = "d"
+version = "4.0"
+source = {PYPI}
+dependencies = [
+    {{ name = "e", marker = "sys_platform == 'win32'" }},
+    {{ name = "b" }},
+]
+
+[[package]]
+name = "e"
+version = "5.0"
+source = {PYPI}
+
+[[package]]
+name = "pytest"
+version = "8.0"
+source = {PYPI}
+
+[[package]]
+name = "unused"
+version = "6.0"
+source = {PYPI}
+"""
+    )
+
+    assert requirements_from_lock(lock) == (
+        "a==1.0",
+        # Required unconditionally via a, so d's marker is dropped
+        "b==2.0",
+        "c==3.0",
+        "d==4.0 ; platform_machine == 'x86_64'",
+        "e==5.0 ; (platform_machine == 'x86_64') and (sys_platform == 'win32')",
+    )
+
+
+def test_forked_versions():
+    lock = _lock(
+        f"""
+dependencies = [
+    {{ name = "numpy", version = "1.26.4", source = {PYPI}, marker = "python_full_version < '3.14'" }},
+    {{ name = "numpy", version = "2.3.0", source = {PYPI}, marker = "python_full_version >= '3.14'" }},
+]
+
+[[package]]
+name = "numpy"
+version = "1.26.4"
+source = {PYPI}
+
+[[package]]
+name = "numpy"
+version = "2.3.0"
+source = {PYPI}
+"""
+    )
+
+    assert requirements_from_lock(lock) == (
+        "numpy==1.26.4 ; python_full_version < '3.14'",
+        "numpy==2.3.0 ; python_full_version >= '3.14'",
+    )
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        '{ git = "https://github.com/example/a?rev=main#0123abc" }',
+        '{ url = "https://example.com/a-1.0.tar.gz" }',
+        '{ path = "vendor/a-1.0-py3-none-any.whl" }',
+        '{ directory = "../a" }',
+    ],
+)
+def test_non_registry_source_raises(source):
+    lock = _lock(
+        f"""
+dependencies = [{{ name = "a" }}]
+
+[[package]]
+name = "a"
+version = "1.0"
+source = {source}
+"""
+    )
+
+    with pytest.raises(ValueError, match="not from a registry"):
+        requirements_from_lock(lock)